@@ -5,13 +5,14 @@
 # ///
 
 import asyncio
+import functools
+import itertools
 import secrets
 import sys
 import random
 import os
 import shutil
-import uuid
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 try:
     from textual.app import App, ComposeResult
@@ -21,9 +22,9 @@ try:
     # DOMQuery, events, Message removed as they appear unused
     from textual.reactive import reactive
 
-    from rich.text import Text
+    from textual.content import Content
+    # rich.text.Text removed: all labels are built as Textual Content.
     # Align, ConsoleOptions, Console, RenderResult, Measurement, Segments removed
-    # Assuming Textual handles Rich integration sufficiently with just Text for this app's needs.
 
 except ImportError:
     print("Run: uv cache clean && uv run multi_dice_roller.py", file=sys.stderr)
@@ -84,67 +85,108 @@ DICE_ART: Dict[int, str] = {
     ),
 }
 
+# Renderable content for each face, built once and shared by every die widget.
+# Textual Content is used as-is by Label.update: a plain str would be parsed as
+# markup and a Rich Text converted on every update. Centring comes from the
+# .die-emoji-label CSS, so no justify setting is needed. DICE_FACES[0] is face 1.
+DICE_FACES: Tuple[Content, ...] = tuple(Content(DICE_ART[i]) for i in range(1, 7))
+
+# Small dice glyphs used in the frequency summary. Index 0 is unused so a
+# face value can index the tuple directly.
+DICE_EMOJIS: Tuple[str, ...] = ("", "⚀", "⚁", "⚂", "⚃", "⚄", "⚅")
+
+NO_RESULTS_MESSAGE = "No results yet"
+
+# Grid layout (columns, rows) indexed by dice count. Index 0 is the empty grid.
+GRID_LAYOUTS: Tuple[Tuple[int, int], ...] = (
+    (0, 0), (1, 1), (2, 1), (3, 1), (2, 2), (3, 2), (3, 2), (4, 2), (4, 2),
+)
+
+# (row step, column step) for each navigate_dice direction
+NAV_STEPS: Dict[str, Tuple[int, int]] = {
+    "up": (-1, 0), "down": (1, 0), "left": (0, -1), "right": (0, 1),
+}
+
+# Serial numbers for die widget IDs. IDs only need to be unique within the app,
+# so a counter replaces the random suffix a die used to get.
+DIE_ID_COUNTER = itertools.count()
+
 # --- Utility Functions ---
 
 def get_grid_layout_dimensions(dice_count: int) -> Tuple[int, int]:
     """Calculate optimal grid layout dimensions (columns, rows) for a given number of dice."""
-    layout_map = {
-        1: (1, 1), 2: (2, 1), 3: (3, 1), 4: (2, 2),
-        5: (3, 2), 6: (3, 2), 7: (4, 2), 8: (4, 2)
-    }
-    if not (1 <= dice_count <= 8):
-        # Fallback for invalid counts. App logic should prevent 0 or <0.
-        # For dice_count = 0, an empty grid is usually handled separately.
-        # Returning (0,0) for 0 dice, and a default for >8 or other unexpected.
-        if dice_count == 0:
-            return (0, 0)
-        # Default for > 8 dice or other unexpected values (e.g. negative, though MIN_DICE=1)
-        # A small grid or error might be appropriate. For now, let's use a 4-column grid.
-        # This case should ideally not be reached if MIN_DICE/MAX_DICE are enforced.
-        # The spec's map only covers 1-8.
-        # Returning a default like (4, (dice_count + 3) // 4) as in old func for >8
-        if dice_count > 8 :
-            return (4, (dice_count + 3) // 4)
-        return (1,1) # Default for any other unexpected values (e.g. negative if checks fail)
-    return layout_map.get(dice_count, (1, 1)) # .get with default for safety, though keys 1-8 are covered.
-
-def calculate_frequencies(results: List[int]) -> Dict[int, int]:
-    """Calculates the frequency of each die face in the results."""
-    frequencies: Dict[int, int] = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0}
+    if 0 <= dice_count < len(GRID_LAYOUTS):
+        return GRID_LAYOUTS[dice_count]
+    if dice_count > 0:
+        # Beyond the spec's 1-8 range; MAX_DICE should prevent this. Use a 4-column grid.
+        return (4, (dice_count + 3) // 4)
+    return (1, 1) # Default for any other unexpected values (e.g. negative if checks fail)
+
+def calculate_frequencies(results: List[int]) -> List[int]:
+    """Calculates the frequency of each die face in the results.
+
+    Returns a 7-slot list indexed by face value (index 0 is unused). Results
+    always come from roll_dice() or the all-ones default, so every value is
+    already a valid face and is used as an index without a range check.
+    """
+    frequencies = [0] * 7
     for result in results:
-        if 1 <= result <= 6:
-            frequencies[result] += 1
+        frequencies[result] += 1
     return frequencies
 
-def format_frequencies(frequencies: Dict[int, int]) -> str:
+# With at most 8 dice there are only a few thousand distinct count tuples, and
+# the same ones recur across rolls, so the formatted strings are memoised.
+@functools.lru_cache(maxsize=4096)
+def _format_frequency_counts(frequencies: Tuple[int, ...]) -> str:
+    parts = []
+    for face_value in range(1, 7):  # Already in display order, no need to sort
+        count = frequencies[face_value]
+        if count > 0:
+            parts.append(f"{count}x{DICE_EMOJIS[face_value]}")
+    return " | ".join(parts) if parts else NO_RESULTS_MESSAGE
+
+def format_frequencies(frequencies: Sequence[int]) -> str:
     """Formats the frequency data into a display string.
     Example: "1x⚀ | 2x⚁ | 1x⚅"
     """
-    # Standard dice emojis
-    dice_emojis = ["", "⚀", "⚁", "⚂", "⚃", "⚄", "⚅"] # Index 0 is unused
+    return _format_frequency_counts(tuple(frequencies))
 
-    parts = []
-    for face_value in sorted(frequencies.keys()):
-        count = frequencies[face_value]
-        if count > 0:
-            parts.append(f"{count}x{dice_emojis[face_value]}")
-    return " | ".join(parts) if parts else "No results yet"
+@functools.lru_cache(maxsize=None)
+def roll_button_label(dice_count: int) -> Content:
+    """Returns the roll button label for `dice_count` dice, built once per count."""
+    if dice_count == 1:
+        return Content("🎲 Roll Die")
+    return Content(f"🎲 Roll {dice_count} Dice")
 
-def detect_terminal_capabilities() -> dict:
-    """Detect terminal dimensions and basic feature support."""
-    try:
-        columns, rows = shutil.get_terminal_size()
-    except Exception:
-        columns, rows = 80, 24
+@functools.lru_cache(maxsize=1)
+def detect_terminal_features() -> Tuple[bool, bool]:
+    """Detect (emoji, truecolor) support from the environment.
 
+    Cached, since the environment does not change while the app runs.
+    """
     emoji_support = (
         sys.platform != "win32"
         and ("UTF-8" in os.environ.get("LC_CTYPE", "")
              or "UTF-8" in os.environ.get("LANG", ""))
     )
     truecolor = os.environ.get("COLORTERM", "") in {"truecolor", "24bit"}
+    return emoji_support, truecolor
 
-# --- End Utility Functions ---
+def detect_terminal_capabilities(size: Optional[Tuple[int, int]] = None) -> dict:
+    """Detect terminal dimensions and basic feature support.
+
+    Pass `size` as (columns, rows) when it is already known (e.g. from Textual)
+    to skip querying the terminal again.
+    """
+    if size is not None:
+        columns, rows = size
+    else:
+        try:
+            columns, rows = shutil.get_terminal_size()
+        except Exception:
+            columns, rows = 80, 24
+
+    emoji_support, truecolor = detect_terminal_features()
     return {
         "width": columns,
         "height": rows,
@@ -152,72 +194,69 @@ def detect_terminal_capabilities() -> dict:
         "emoji": emoji_support,
     }
 
-# --- End Utility Functions ---
+def roll_dice(count: int) -> List[int]:
+    """Roll `count` six-sided dice in one pass using the cryptographic RNG."""
+    randbelow = secrets.randbelow
+    return [randbelow(6) + 1 for _ in range(count)]
 
-# --- Random Float Utility (as per spec) ---
-def random_float(min_val: float, max_val: float) -> float:
-    """
-    Generates a cryptographically secure random float within a given range [min_val, max_val).
-    Uses secrets.token_bytes for randomness and normalizes it to the specified range.
-    """
-    if not (isinstance(min_val, (int, float)) and isinstance(max_val, (int, float))):
-        raise TypeError("min_val and max_val must be numbers")
-    if min_val >= max_val:
-        # Or handle as an error, e.g., raise ValueError
-        # For now, allowing min_val == max_val, which will just return min_val
-        if min_val > max_val: # If strictly greater, maybe raise error or swap
-             raise ValueError("min_val cannot be greater than max_val")
-        return min_val
+# --- End Utility Functions ---
 
+# --- Animation Controller Class ---
+class DiceAnimationController:
+    """Handles die animations independently from the main app.
 
-    byte_count = 4 # 32 bits for precision
-    try:
-        raw_bytes = secrets.token_bytes(byte_count)
-    except Exception:
-        # Fallback to standard random if secrets.token_bytes fails (highly unlikely in normal environments).
-        # This ensures the function still returns a value, albeit less secure.
-        normalized_float = random.random()
-    else:
-        normalized_int = int.from_bytes(raw_bytes, 'big')
-        # (2**(byte_count*8) - 1) is the max possible integer value for that many bytes
-        max_int_val = (1 << (byte_count * 8)) -1 # More efficient calculation for 2**N - 1
-        if max_int_val == 0: # Avoid division by zero if byte_count was 0 (not the case here)
-            normalized_float = 0.0
-        else:
-            normalized_float = normalized_int / max_int_val
+    Animation frames and durations are purely cosmetic, so they come from the
+    `random` module rather than the OS CSPRNG; only final results use `secrets`.
+    """
 
-    return min_val + normalized_float * (max_val - min_val)
+    FRAME_INTERVAL = 0.05  # Seconds per animation frame (20fps)
+    # Each die animates for 0.3-0.6 seconds, i.e. 6-11 frames at FRAME_INTERVAL.
+    MIN_FRAMES = 6
+    MAX_FRAMES = 11
 
-# --- Animation Controller Class ---
-class DiceAnimationController:
-    """Handles die animations independently from the main app."""
+    __slots__ = ("dice_widgets", "faces")
 
-    def __init__(self, dice_widgets: List[Label], emojis: List[str]):
+    def __init__(self, dice_widgets: List[Label], faces: Sequence[Content]):
         self.dice_widgets = dice_widgets
-        self.emojis = emojis
-
-    @staticmethod
-    def generate_random_duration() -> float:
-        """Return a secure random duration between 0.3 and 0.6 seconds."""
-        return random_float(0.3, 0.6)
-
-    async def animate_single_die(self, index: int, duration: float) -> int:
-        if not (0 <= index < len(self.dice_widgets)):
-            return 1
-        die_widget = self.dice_widgets[index]
-        frames = int(duration / 0.05) or 1
-        die_widget.add_class("rolling")
-        for _ in range(frames):
-            die_widget.update(Text(secrets.choice(self.emojis), justify="center"))
-            await asyncio.sleep(0.05)
-        result = secrets.randbelow(6) + 1
-        die_widget.update(Text(self.emojis[result - 1], justify="center"))
-        die_widget.remove_class("rolling")
-        return result
+        self.faces = faces
+
+    def generate_frames(self) -> List[Content]:
+        """Return a random sequence of faces lasting a random 0.3-0.6 seconds."""
+        return random.choices(self.faces, k=random.randint(self.MIN_FRAMES, self.MAX_FRAMES))
 
     async def animate_all_dice(self, indices: List[int]) -> List[int]:
-        tasks = [asyncio.create_task(self.animate_single_die(i, self.generate_random_duration())) for i in indices]
-        return await asyncio.gather(*tasks)
+        """Animate the dice at `indices` and return their final faces in the same order.
+
+        All dice advance together on one shared 20fps tick, so each frame is a
+        single event-loop wake-up no matter how many dice are rolling.
+        """
+        # Final faces are drawn up front in a single batch; the animations only reveal them.
+        results = roll_dice(len(indices))
+        # Each die's frame sequence ends on its final face.
+        frame_rows = [
+            self.generate_frames() + [self.faces[result - 1]]
+            for result in results
+        ]
+        widgets = [self.dice_widgets[i] for i in indices]
+        for die_widget in widgets:
+            die_widget.add_class("rolling")
+
+        total_ticks = max((len(frames) for frames in frame_rows), default=0)
+        try:
+            for tick in range(total_ticks):
+                for die_widget, frames in zip(widgets, frame_rows):
+                    if tick < len(frames):
+                        die_widget.update(frames[tick])
+                        if tick == len(frames) - 1:
+                            die_widget.remove_class("rolling")
+                if tick < total_ticks - 1:
+                    await asyncio.sleep(self.FRAME_INTERVAL)
+        finally:
+            # An aborted animation must not leave dice styled as rolling; for dice
+            # that already finished this is a no-op.
+            for die_widget in widgets:
+                die_widget.remove_class("rolling")
+        return results
 
 # --- Main Application Class ---
 
@@ -368,9 +407,9 @@ class DiceRollerApp(App[None]):
 
     TITLE = "🎲 Multi-Dice Roller"
 
+    # Aliases share one Binding with comma-separated keys; Textual expands them.
     BINDINGS = [
-        Binding("r", "roll_unlocked_dice", "Roll Unlocked Dice", show=True), # Changed action
-        Binding("enter", "roll_unlocked_dice", "Roll Unlocked Dice", show=False), # Changed action
+        Binding("r,enter", "roll_unlocked_dice", "Roll Unlocked Dice", show=True), # Changed action
         Binding("space", "toggle_lock", "Lock/Unlock Die", show=True), # Changed
 
         Binding("up", "navigate_dice('up')", "Navigate Up", show=False),
@@ -381,75 +420,88 @@ class DiceRollerApp(App[None]):
         Binding("ctrl+l", "lock_all", "Lock All", show=True),
         Binding("ctrl+u", "unlock_all", "Unlock All", show=True),
 
-        Binding("+", "add_die", "Add Die", show=True),
-        Binding("=", "add_die", "Add Die", show=False), # Alias for +
+        Binding("+,=", "add_die", "Add Die", show=True), # = is an unshifted alias for +
 
         Binding("-", "remove_die", "Remove Die", show=True),
 
-        Binding("1", "set_dice_count(1)", "1 Die", show=True, key_display="1"),
-        Binding("2", "set_dice_count(2)", "2 Dice", show=True, key_display="2"),
-        Binding("3", "set_dice_count(3)", "3 Dice", show=True, key_display="3"),
-        Binding("4", "set_dice_count(4)", "4 Dice", show=True, key_display="4"),
-        Binding("5", "set_dice_count(5)", "5 Dice", show=True, key_display="5"),
-        Binding("6", "set_dice_count(6)", "6 Dice", show=True, key_display="6"),
-        Binding("7", "set_dice_count(7)", "7 Dice", show=True, key_display="7"),
-        Binding("8", "set_dice_count(8)", "8 Dice", show=True, key_display="8"),
-
-        Binding("q", "request_quit", "Quit", show=True), # Using request_quit for graceful exit
-        Binding("escape", "request_quit", "Quit", show=False)
+        # Number keys 1-8 all route to the one set_dice_count action. Textual
+        # caches parsed action strings, so these cost no per-keypress parsing.
+        *(
+            Binding(str(n), f"set_dice_count({n})", f"{n} {'Die' if n == 1 else 'Dice'}", show=True, key_display=str(n))
+            for n in range(1, 9)
+        ),
+
+        Binding("q,escape", "request_quit", "Quit", show=True), # Using request_quit for graceful exit
         # Ctrl+C is usually handled by Textual by default to quit
     ]
 
     # Reactive properties
     dice_count: reactive[int] = reactive(1)
     is_rolling: reactive[bool] = reactive(False)
-    current_results: reactive[List[int]] = reactive([]) # Default to empty list
-    current_sum: reactive[int] = reactive(0) # Adjusted due to empty results
-    current_frequencies_str: reactive[str] = reactive("No results yet") # Adjusted
     selected_die_index: reactive[int] = reactive(0) # Added from spec
-    locked_dice: reactive[set[int]] = reactive(set) # Added from spec
+    # Bit i is set when die i is locked. MAX_DICE is small, so an int is enough, and
+    # every change is a new value, so the watcher always fires.
+    locked_mask: reactive[int] = reactive(0) # Added from spec
     app_roll_count: reactive[int] = reactive(0) # Total rolls in thesession
 
+    # Results and the stats derived from them are plain attributes, not reactives:
+    # apply_results() updates them and every view that depends on them in one pass.
+    current_results: List[int] = []
+    current_sum: int = 0
+    current_frequencies_str: str = NO_RESULTS_MESSAGE
+
+    # Indices of the dice a roll will animate. Rebuilt (never mutated) by the
+    # dice_count and locked_mask watchers so a roll does not have to scan for them.
+    unlocked_indices: List[int] = []
+
     # Maximum number of dice
     MAX_DICE = 8
     MIN_DICE = 1
 
-    # Placeholder for dice widgets. We will populate this in on_mount or when dice_count changes.
-    # Using a list to store references to the Label widgets for the dice.
+    # References to the Label widgets for the dice, populated when dice_count changes.
+    # compose() gives each app its own list, which the animation controller shares.
     dice_widgets: List[Label] = []
-    # Use larger ASCII representations instead of small emoji faces
-    dice_emojis: List[str] = [DICE_ART[i] for i in range(1, 7)]
     terminal_caps: Dict[str, Any] = {}
-    animation_controller: Optional[DiceAnimationController] = None
+    animation_controller: DiceAnimationController
+
+    # Grid (columns, rows) whose CSS class is currently applied to dice_grid
+    grid_layout: Tuple[int, int] = (0, 0)
+
+    # Toast on every single-die lock toggle. Off by default: the .locked styling
+    # already shows the change, and each toast is a new widget with its own timer.
+    notify_lock_changes: bool = False
+
+    # Widget references assigned in compose()
+    main_container: Container
+    dice_grid: Grid
+    sum_display: Label
+    frequency_display: Label
+    roll_button: Button
+    reset_button: Button
+
+    # Set while a subtitle rebuild is queued; see schedule_subtitle_update.
+    subtitle_dirty: bool = False
 
     # --- Visual State Update Method ---
     def update_dice_visual_states(self) -> None:
         """
         Updates the visual state (CSS classes for .selected and .locked) of all dice widgets
-        based on the current `self.selected_die_index` and `self.locked_dice` set.
+        based on the current `self.selected_die_index` and `self.locked_mask` bits.
         """
         if not self.dice_widgets: # No widgets to update
             return
 
+        # set_class only touches a widget whose classes actually change, so dice
+        # that keep their state cost no CSS refresh. A die that is both selected
+        # and locked gets both classes; the current CSS composes them reasonably.
         for i, die_widget in enumerate(self.dice_widgets):
-            die_widget.remove_class("selected", "locked") # Clear existing states
-
-            is_selected = (i == self.selected_die_index)
-            is_locked = (i in self.locked_dice)
-
-            if is_selected:
-                die_widget.add_class("selected")
-
-            if is_locked:
-                die_widget.add_class("locked")
-
-            # If a die is both selected and locked, it will have both classes.
-            # CSS specificity or class order might matter if styles conflict.
-            # Current CSS for .selected and .locked should compose reasonably.
+            die_widget.set_class(i == self.selected_die_index, "selected")
+            die_widget.set_class(bool(self.locked_mask >> i & 1), "locked")
 
     def on_mount(self) -> None:
         """Called when the app is first mounted. Initializes subtitle and UI elements."""
-        self.terminal_caps = detect_terminal_capabilities()
+        # Textual already knows the terminal size, so pass it rather than re-querying.
+        self.terminal_caps = detect_terminal_capabilities((self.size.width, self.size.height))
 
         min_width = 60
         min_height = 20
@@ -472,33 +524,46 @@ class DiceRollerApp(App[None]):
                 timeout=4,
             )
 
-        self.sub_title = f"{self.dice_count} die | Sum: {self.current_sum} | Roll #{self.app_roll_count}"
-        self.update_dice_grid_display()  # Initial setup of dice widgets
-        self.animation_controller = DiceAnimationController(self.dice_widgets, self.dice_emojis)
+        # The dice grid itself is built by watch_dice_count when the reactives initialise.
         self.update_stats_display()
         self.update_button_states() # Ensure button states are correct on mount
-        self.call_later(self.update_dice_visual_states) # Ensure it runs after initial dice are created
 
     def compose(self) -> ComposeResult:
         """Create child widgets for the app."""
         yield Header(self.TITLE)
 
-        with Container(id="main-container"):
+        # Widgets that are updated after startup are kept as attributes so the
+        # update paths never have to query the DOM for them. They are created
+        # here rather than in on_mount because the reactive watchers first run
+        # straight after compose.
+        self.main_container = Container(id="main-container")
+        self.dice_grid = Grid(id="dice-grid-container")
+        self.sum_display = Label(f"Sum: {self.current_sum}", id="sum-display")
+        self.frequency_display = Label(self.current_frequencies_str, id="frequency-display")
+        self.roll_button = Button("🎲 Roll All Dice", id="roll-button", variant="primary")
+        self.reset_button = Button("🔄 Reset", id="reset-button")
+
+        # update_dice_grid_display resizes dice_widgets in place, so a controller
+        # holding the same list always sees the current dice.
+        self.dice_widgets = []
+        self.animation_controller = DiceAnimationController(self.dice_widgets, DICE_FACES)
+
+        with self.main_container:
 
 
             # Dice Grid
             # The actual dice Label widgets will be added/removed dynamically in update_dice_grid_display
-            yield Grid(id="dice-grid-container")
+            yield self.dice_grid
 
             # Statistics Display
             with Vertical(classes="stats-container"):
-                yield Label(f"Sum: {self.current_sum}", id="sum-display")
-                yield Label(self.current_frequencies_str, id="frequency-display")
+                yield self.sum_display
+                yield self.frequency_display
 
             # Action Buttons
             with Horizontal(classes="action-buttons-container"):
-                yield Button("🎲 Roll All Dice", id="roll-button", variant="primary")
-                yield Button("🔄 Reset", id="reset-button")
+                yield self.roll_button
+                yield self.reset_button
 
             yield Label("Press 'r' to roll, '+'/'-' for dice, '1-8' for count, 'q' to quit", id="instructions")
 
@@ -506,14 +571,14 @@ class DiceRollerApp(App[None]):
 
     def watch_dice_count(self, old_value: int, new_value: int) -> None:
         """Called when dice_count changes."""
-
+        self.update_unlocked_indices()
 
         self.update_dice_grid_display() # This recreates dice_widgets
         # Reset results when dice count changes
         if self.dice_count > 0:
-             self.current_results = [1] * new_value # Default to 1s if dice exist
+             self.apply_results([1] * new_value) # Default to 1s if dice exist
         else:
-             self.current_results = []
+             self.apply_results([])
 
         # Clamp selected_die_index if it's out of bounds
         if self.selected_die_index >= self.dice_count and self.dice_count > 0:
@@ -521,26 +586,11 @@ class DiceRollerApp(App[None]):
         elif self.dice_count == 0:
             self.selected_die_index = 0
 
-        self.update_stats_display() # Update sum/freq for new default dice
-        self.call_later(self.update_dice_visual_states) # Update visuals for new grid
-
         # Adapt main container layout to dice count (from spec's pseudocode)
-        # Ensure main_container and roll_button also exist before querying them.
-        # A more robust solution might involve checking self.is_mounted for these elements
-        # if errors occur during very early/rapid dice_count changes.
-        try:
-            main_container = self.query_one("#main-container")
-            roll_button = self.query_one("#roll-button", Button)
-
-            main_container.styles.width = "100%"  # Fill available width
-            main_container.styles.height = "auto"
+        self.main_container.styles.width = "100%"  # Fill available width
+        self.main_container.styles.height = "auto"
 
-            if self.dice_count == 1:
-                roll_button.label = Text("🎲 Roll Die")
-            else:
-                roll_button.label = Text(f"🎲 Roll {self.dice_count} Dice")
-        except Exception:  # Catch potential NoMatches if these are also queried too early
-            pass  # If they don't exist yet, their properties will be set by compose or later calls
+        self.roll_button.label = roll_button_label(self.dice_count)
 
         self.update_button_states()
 
@@ -549,39 +599,64 @@ class DiceRollerApp(App[None]):
         self.update_button_states()
         # Could also change status message here
 
-    def watch_current_results(self, old_results: List[int], new_results: List[int]) -> None:
-        """Update dice faces when results change."""
-        dice_emojis = [""] + self.dice_emojis
-        for i, widget in enumerate(self.dice_widgets):
-            if i < len(new_results):
-                widget.update(Text(dice_emojis[new_results[i]], justify="center"))
-            else: # Should not happen if dice_widgets is synced with dice_count
-                widget.update("")
-        self.update_stats_display()
-
     def watch_app_roll_count(self, old_count: int, new_count: int) -> None:
         """Update header subtitle when roll count or other stats change."""
-        self.update_header_subtitle()
-
-    def watch_current_sum(self, old_sum: int, new_sum: int) -> None:
-        """Update header subtitle when sum changes."""
-        self.update_header_subtitle()
+        self.schedule_subtitle_update()
 
-    async def watch_selected_die_index(self, old_index: int, new_index: int) -> None:
+    def watch_selected_die_index(self, old_index: int, new_index: int) -> None:
         """Called when selected_die_index changes."""
         self.update_dice_visual_states()
 
-    async def watch_locked_dice(self, old_set: set[int], new_set: set[int]) -> None:
-        """Called when locked_dice changes."""
-        # Ensure this is triggered correctly. For sets, direct mutation might not trigger.
-        # If issues, assign a new set: self.locked_dice = new_set_instance
+    def watch_locked_mask(self, old_mask: int, new_mask: int) -> None:
+        """Called when locked_mask changes."""
+        self.update_unlocked_indices()
         self.update_dice_visual_states()
 
 
     # --- UI Update Methods ---
 
+    def update_unlocked_indices(self) -> None:
+        """Rebuilds `unlocked_indices` from the current dice count and lock bits."""
+        self.unlocked_indices = [i for i in range(self.dice_count) if not self.locked_mask >> i & 1]
+
+    def apply_results(self, new_results: List[int]) -> None:
+        """Stores new results and refreshes the dice faces, stats labels and subtitle.
+
+        Only dice whose value differs from the previous results are redrawn, so
+        locked dice and dice that were already showing the value are skipped.
+        """
+        old_results = self.current_results
+        self.current_results = new_results
+        with self.batch_update():
+            for i, widget in enumerate(self.dice_widgets):
+                new_value = new_results[i] if i < len(new_results) else None
+                old_value = old_results[i] if i < len(old_results) else None
+                if new_value == old_value:
+                    continue
+                if new_value is not None:
+                    widget.update(DICE_FACES[new_value - 1])
+                else: # Should not happen if dice_widgets is synced with dice_count
+                    widget.update("")
+            self.update_stats_display()
+
+    def schedule_subtitle_update(self) -> None:
+        """Marks the subtitle as stale and rebuilds it once after the next refresh.
+
+        A roll changes the sum and then the roll count, and each asks for a new
+        subtitle; queuing a single rebuild collapses them into one header update.
+        """
+        if not self.subtitle_dirty:
+            self.subtitle_dirty = True
+            self.call_after_refresh(self.flush_subtitle_update)
+
+    def flush_subtitle_update(self) -> None:
+        """Applies a queued subtitle refresh, if still needed."""
+        if self.subtitle_dirty:
+            self.update_header_subtitle()
+
     def update_header_subtitle(self) -> None:
         """Updates the header's subtitle with current game status."""
+        self.subtitle_dirty = False
         die_label = "die" if self.dice_count == 1 else "dice"
         self.sub_title = (
             f"{self.dice_count} {die_label} | Sum: {self.current_sum} | Roll #{self.app_roll_count}"
@@ -589,95 +664,71 @@ class DiceRollerApp(App[None]):
 
     def update_dice_grid_display(self) -> None:
         """Update the dice grid based on the current dice_count."""
-        grid_query = self.query("#dice-grid-container")
-        if not grid_query:
-            return # If the grid container doesn't exist yet, do nothing
-
-        grid = grid_query.first(Grid)
-
-        # Clear existing dice widgets from the list and grid
-        # Call grid.remove_children() first to ensure all children are detached from the grid.
-        grid.remove_children()
-
-        # Then, iterate through the known dice_widgets to ensure they are fully removed
-        # from the app's perspective (e.g., ID unregistration, other cleanup).
-        # At this point, their parent should be None.
-        for widget in self.dice_widgets:
-            widget.remove() # This should handle Textual's internal cleanup for the widget.
-        self.dice_widgets.clear() # Clear our Python list of references.
-
-        # Calculate optimal grid dimensions using the new function
-        cols, rows = get_grid_layout_dimensions(self.dice_count)
-
-        if cols == 0 or rows == 0: # Handles dice_count == 0
-            # Ensure grid is effectively empty or hidden, no specific classes needed.
-            # Textual might handle grid-size 0,0 by making it disappear.
-            # Or, set a very small size / display: none if required.
-            # For now, assuming removing children and not adding classes is enough.
-            # We can also explicitly set grid.styles.grid_size_columns = 0 etc.
-            # Let's clear any existing grid-NXM classes if any were set.
-            current_classes = list(grid.classes)
-            for css_class in current_classes:
-                if css_class.startswith("grid-") and 'x' in css_class:
-                    grid.remove_class(css_class)
-            # Optionally set grid.styles.display = "none" or grid.styles.width/height = 0
-            return # No dice to display
-
-        # Remove existing grid classes
-        # A more robust way to remove only our specific grid classes
-        current_classes = list(grid.classes) # Get a copy
-        for css_class in current_classes:
-            if css_class.startswith("grid-") and 'x' in css_class: # e.g. "grid-2x2"
-                # Basic check, assumes our classes are well-formed like "grid-1x1"
-                grid.remove_class(css_class)
-
-        # Apply new grid class based on cols and rows from get_grid_layout_dimensions
-        # The CSS classes .grid-XxY are responsible for setting grid-size-columns and grid-size-rows
-        if cols > 0 and rows > 0:
-            grid.add_class(f"grid-{cols}x{rows}")
-        # else: If cols/rows are 0 (e.g. dice_count is 0), no class is added, grid remains empty.
-
-        # Create and add new dice labels
-        dice_emojis = [""] + self.dice_emojis
-        for i in range(self.dice_count):
-            initial_face = dice_emojis[self.current_results[i] if i < len(self.current_results) else 1]
-            unique_id = f"die-{i}-{uuid.uuid4().hex}"
-            die_label = Label(Text(initial_face, justify="center"), classes="die-emoji-label", id=unique_id)
-            self.dice_widgets.append(die_label)
-            grid.mount(die_label)
-
-        self.animation_controller = DiceAnimationController(self.dice_widgets, self.dice_emojis)
+        grid = self.dice_grid
+        # Read the reactive once, before measuring the widget list. The first read of
+        # dice_count runs its watcher, which re-enters this method; a count taken
+        # from dice_widgets before that would be stale.
+        dice_count = self.dice_count
+
+        # Suspend repaints so the removals, class change and mounts paint as one frame.
+        with self.batch_update():
+            # Only the difference between the old and new dice count is touched:
+            # surplus dice are removed from the tail, existing dice are kept and
+            # any extra dice are mounted after the dice loop below.
+            old_count = len(self.dice_widgets)
+            surplus = self.dice_widgets[dice_count:]
+            if surplus:
+                grid.remove_children(surplus) # One prune for all surplus dice
+                del self.dice_widgets[dice_count:]
+
+            # Calculate optimal grid dimensions using the new function. Neighbouring
+            # counts often share a layout (e.g. 5 and 6 dice are both 3x2), in
+            # which case the grid classes are left alone.
+            cols, rows = get_grid_layout_dimensions(dice_count)
+            if (cols, rows) != self.grid_layout:
+                self.grid_layout = (cols, rows)
+
+                # The grid carries no classes other than its grid-NxM layout class,
+                # so replace them wholesale in a single update.
+                # The CSS classes .grid-XxY are responsible for setting grid-size-columns and grid-size-rows
+                # If cols/rows are 0 (e.g. dice_count is 0), no class is set and the grid remains empty.
+                grid.set_classes(f"grid-{cols}x{rows}" if cols > 0 and rows > 0 else ())
+
+            # Create labels for dice beyond the previous count and mount them together
+            new_labels: List[Label] = []
+            for i in range(old_count, dice_count):
+                initial_face = DICE_FACES[(self.current_results[i] if i < len(self.current_results) else 1) - 1]
+                unique_id = f"die-{i}-{next(DIE_ID_COUNTER)}"
+                new_labels.append(Label(initial_face, classes="die-emoji-label", id=unique_id))
+            if new_labels:
+                self.dice_widgets.extend(new_labels)
+                grid.mount_all(new_labels)
+
+            # Classes can be set before the new labels finish mounting, so apply
+            # the selected/locked states here rather than on a later loop pass.
+            self.update_dice_visual_states()
 
     def update_stats_display(self) -> None:
         """Updates the sum and frequency labels from current_results."""
         if not self.current_results:
             self.current_sum = 0
-            self.current_frequencies_str = "No results yet"
+            self.current_frequencies_str = NO_RESULTS_MESSAGE
         else:
             self.current_sum = sum(self.current_results)
             frequencies = calculate_frequencies(self.current_results)
             self.current_frequencies_str = format_frequencies(frequencies)
 
-        sum_display_query = self.query("#sum-display")
-        if sum_display_query:
-            sum_display_query.first(Label).update(f"Sum: {self.current_sum}")
-
-        frequency_display_query = self.query("#frequency-display")
-        if frequency_display_query:
-            frequency_display_query.first(Label).update(self.current_frequencies_str)
+        # Wrapped in Content so the labels take the text as-is; a plain str would
+        # be parsed as markup on every update (see DICE_FACES).
+        self.sum_display.update(Content(f"Sum: {self.current_sum}"))
+        self.frequency_display.update(Content(self.current_frequencies_str))
 
-        self.update_header_subtitle() # Also update header as stats change
+        self.schedule_subtitle_update() # Also update header as stats change
 
     def update_button_states(self) -> None:
         """Enable or disable buttons based on the application state."""
-        try:
-            roll_button = self.query_one("#roll-button", Button)
-            reset_button = self.query_one("#reset-button", Button)
-
-            roll_button.disabled = self.is_rolling
-            reset_button.disabled = self.is_rolling
-        except Exception:  # Covers NoMatches if buttons aren't there yet
-            pass
+        self.roll_button.disabled = self.is_rolling
+        self.reset_button.disabled = self.is_rolling
 
     # --- Action Methods for Dice Management ---
 
@@ -694,7 +745,7 @@ class DiceRollerApp(App[None]):
         elif button_id == "reset-button":
             self.action_reset_dice()
         elif button_id == "roll-button":
-            self.call_later(self.action_roll_unlocked_dice) # Use call_later for async actions from sync handlers
+            self.action_roll_unlocked_dice()
 
 
     def action_add_die(self) -> None:
@@ -703,11 +754,10 @@ class DiceRollerApp(App[None]):
             return
         if self.dice_count < self.MAX_DICE:
             self.dice_count += 1
-            # current_results are updated by the watcher, which then calls update_stats_display
+            # current_results are reset by the dice_count watcher via apply_results
             self.notify(f"Added die. Now {self.dice_count}.", timeout=1.5)
         else:
             self.notify(f"Maximum {self.MAX_DICE} dice allowed.", severity="warning", timeout=2)
-        self.update_button_states() # Ensure buttons reflect new state immediately
 
     def action_remove_die(self) -> None:
         """Decrements the number of dice."""
@@ -715,11 +765,10 @@ class DiceRollerApp(App[None]):
             return
         if self.dice_count > self.MIN_DICE:
             self.dice_count -= 1
-            # current_results are updated by the watcher, which then calls update_stats_display
+            # current_results are reset by the dice_count watcher via apply_results
             self.notify(f"Removed die. Now {self.dice_count}.", timeout=1.5)
         else:
             self.notify(f"Minimum {self.MIN_DICE} die required.", severity="warning", timeout=2)
-        self.update_button_states() # Ensure buttons reflect new state immediately
 
     def action_set_dice_count(self, count: int) -> None:
         """Sets the number of dice directly."""
@@ -731,7 +780,6 @@ class DiceRollerApp(App[None]):
                 self.notify(f"Set dice count to {self.dice_count}.", timeout=1.5)
         else:
             self.notify(f"Dice count must be between {self.MIN_DICE} and {self.MAX_DICE}.", severity="error", timeout=2)
-        self.update_button_states()
 
     def action_reset_dice(self) -> None:
         """
@@ -740,15 +788,13 @@ class DiceRollerApp(App[None]):
         if self.is_rolling:
             return
         if self.dice_count > 0:
-            self.current_results = [1] * self.dice_count
+            self.apply_results([1] * self.dice_count)
         else:
-            self.current_results = []
+            self.apply_results([])
         self.app_roll_count = 0
-        self.locked_dice = set()
+        self.locked_mask = 0
         # Optionally, self.selected_die_index could be reset to 0.
         self.notify("Dice and session stats reset.", timeout=2)
-        self.update_button_states()
-        self.call_later(self.update_dice_visual_states)
 
     # --- Action Methods for Navigation and Locking ---
 
@@ -763,22 +809,12 @@ class DiceRollerApp(App[None]):
         current = self.selected_die_index
         dice_count = self.dice_count
 
-        # Grid columns mapping from spec
-        cols_map = {1:1, 2:2, 3:3, 4:2, 5:3, 6:3, 7:4, 8:4}
-        cols = cols_map.get(dice_count, 1) # Default to 1 col if dice_count not in map (e.g. 0)
-        if dice_count == 0: # avoid division by zero or unexpected behavior with cols=0
-            cols = 1
-
+        # grid_layout is the layout last applied to the grid, so navigation
+        # always matches the screen. dice_count > 0 here, so cols >= 1.
+        cols, _ = self.grid_layout
 
-        new_index = current
-        if direction == "up":
-            new_index = max(0, current - cols)
-        elif direction == "down":
-            new_index = min(dice_count - 1, current + cols)
-        elif direction == "left":
-            new_index = max(0, current - 1)
-        elif direction == "right":
-            new_index = min(dice_count - 1, current + 1)
+        row_step, col_step = NAV_STEPS.get(direction, (0, 0)) # Unknown directions stay put
+        new_index = min(dice_count - 1, max(0, current + row_step * cols + col_step))
 
         if new_index != current:
             self.selected_die_index = new_index
@@ -788,28 +824,27 @@ class DiceRollerApp(App[None]):
         """
         Toggles the lock state of the currently selected die (`self.selected_die_index`).
         If the die is locked, it becomes unlocked, and vice-versa.
-        Updates `self.locked_dice` reactively.
+        Updates `self.locked_mask` reactively.
         """
         if self.is_rolling or self.dice_count == 0:
             return
 
         idx = self.selected_die_index
-        new_locked_set = self.locked_dice.copy() # Important: work with a copy for reactive update
-        if idx in new_locked_set:
-            new_locked_set.remove(idx)
-            self.notify(f"Die {idx+1} unlocked.", timeout=1)
-        else:
-            new_locked_set.add(idx)
+        self.locked_mask ^= 1 << idx
+        if not self.notify_lock_changes:
+            return
+        if self.locked_mask >> idx & 1:
             self.notify(f"Die {idx+1} locked.", timeout=1)
-        self.locked_dice = new_locked_set
+        else:
+            self.notify(f"Die {idx+1} unlocked.", timeout=1)
 
     def action_lock_all(self) -> None:
         """Locks all currently displayed dice."""
         if self.is_rolling or self.dice_count == 0:
             return
-        new_locked_set = set(range(self.dice_count))
-        if new_locked_set != self.locked_dice:
-            self.locked_dice = new_locked_set
+        all_locked_mask = (1 << self.dice_count) - 1
+        if all_locked_mask != self.locked_mask:
+            self.locked_mask = all_locked_mask
             self.notify("All dice locked.", timeout=1)
         else:
             self.notify("All dice already locked.", timeout=1)
@@ -818,25 +853,24 @@ class DiceRollerApp(App[None]):
         """Unlocks all currently displayed dice."""
         if self.is_rolling or self.dice_count == 0:
             return
-        if self.locked_dice:
-            self.locked_dice = set()
+        if self.locked_mask:
+            self.locked_mask = 0
             self.notify("All dice unlocked.", timeout=1)
         else:
             self.notify("All dice already unlocked.", timeout=1)
 
     # --- Core Dice Rolling Logic ---
 
-    async def action_roll_unlocked_dice(self) -> None:
+    def action_roll_unlocked_dice(self) -> None:
         """
-        Handles the core logic for rolling dice:
+        Starts a roll of the unlocked dice:
         1. Identifies unlocked dice.
         2. If no dice are unlocked, notifies the user.
-        3. Otherwise, animate each unlocked die in parallel using
-           ``DiceAnimationController``.
-        4. Gathers results from the controller.
-        5. Updates `self.current_results` with the new values for rolled dice.
-        6. Increments `self.app_roll_count`.
-        7. Sets `self.is_rolling` to False and updates UI states.
+        3. Otherwise, sets `self.is_rolling` and hands the roll to
+           `roll_unlocked_dice` in a worker.
+        The checks are synchronous, so key presses that cannot start a roll
+        never create a coroutine, and the app keeps processing messages while
+        the animation runs.
         """
         if self.is_rolling:
             return
@@ -845,65 +879,68 @@ class DiceRollerApp(App[None]):
             self.notify("No dice to roll.", severity="warning", timeout=2)
             return
 
-        unlocked_indices = [i for i in range(self.dice_count) if i not in self.locked_dice]
+        unlocked_indices = self.unlocked_indices
 
         if not unlocked_indices:
             self.notify("All dice are locked. Nothing to roll.", severity="info", timeout=2)
-            roll_button = self.query_one("#roll-button", Button)
-            if self.dice_count == 1 :
-                 roll_button.label = Text("🎲 Roll Die")
-            else:
-                 roll_button.label = Text(f"🎲 Roll {self.dice_count} Dice")
+            self.roll_button.label = roll_button_label(self.dice_count)
             return
 
-        self.is_rolling = True
-        self.notify("Rolling unlocked dice...", timeout=0.2)
-
-        if not self.animation_controller:
-            self.animation_controller = DiceAnimationController(self.dice_widgets, self.dice_emojis)
+        self.is_rolling = True # The disabled buttons and the animation itself show the roll
+        self.run_worker(self.roll_unlocked_dice(unlocked_indices), group="roll")
 
+    async def roll_unlocked_dice(self, unlocked_indices: List[int]) -> None:
+        """
+        Runs a roll started by `action_roll_unlocked_dice`:
+        1. Animates the unlocked dice together on the shared frame tick of
+           ``DiceAnimationController``.
+        2. Collects the results returned by the controller.
+        3. Updates `self.current_results` with the new values for rolled dice.
+        4. Increments `self.app_roll_count`.
+        5. Sets `self.is_rolling` to False and updates UI states.
+        """
         try:
             results_for_unlocked_dice = await self.animation_controller.animate_all_dice(unlocked_indices)
         except Exception as e:
             self.notify(f"Animation error: {e}", severity="error", timeout=3)
+            # The results are unchanged, so apply_results would skip these dice;
+            # put back the faces the interrupted animation may have left behind.
+            for i in unlocked_indices:
+                self.dice_widgets[i].update(DICE_FACES[self.current_results[i] - 1])
             self.is_rolling = False
-            self.call_later(self.update_dice_visual_states)
             return
-        # No 'else' needed here, if tasks is empty, results_for_unlocked_dice remains empty.
+        # No 'else' needed here, if no dice are animated, results_for_unlocked_dice remains empty.
         # This case is already handled by 'if not unlocked_indices' check.
 
         # --- Results Phase ---
+        # dice_count cannot change mid-roll and watch_dice_count always applies a
+        # full result list, so current_results already has one entry per die. A
+        # fresh copy is still needed: apply_results diffs it against the old list.
         new_results_list = list(self.current_results)
 
-        if len(new_results_list) != self.dice_count:
-             new_results_list = [1] * self.dice_count # Safeguard
-
         rolled_at_least_one = False
-        # Ensure results from gather match the number of tasks/unlocked_indices
-        if len(unlocked_indices) == len(results_for_unlocked_dice):
-            for i, actual_die_index in enumerate(unlocked_indices):
-                # actual_die_index is the true index in self.dice_widgets / self.current_results
-                # results_for_unlocked_dice[i] is the result for that die
-                if 0 <= actual_die_index < self.dice_count: # Bounds check
-                    new_results_list[actual_die_index] = results_for_unlocked_dice[i]
-                    rolled_at_least_one = True
-        else:
-            # This indicates a mismatch, should not happen if asyncio.gather worked as expected.
+        # strict=True raises ValueError if the controller did not return one result per unlocked die
+        try:
+            for actual_die_index, result in zip(unlocked_indices, results_for_unlocked_dice, strict=True):
+                # actual_die_index is the true index in self.dice_widgets / self.current_results;
+                # unlocked_indices only holds indices below dice_count, so no bounds check is needed.
+                new_results_list[actual_die_index] = result
+                rolled_at_least_one = True
+        except ValueError:
+            # This indicates a mismatch, should not happen if the controller worked as expected.
             self.notify("Error processing roll results (result/index mismatch).", severity="error", timeout=3)
             self.is_rolling = False
-            self.call_later(self.update_dice_visual_states)
             return
 
         if rolled_at_least_one:
-            self.current_results = new_results_list
+            self.apply_results(new_results_list)
             self.app_roll_count += 1
         else:
             # This might happen if unlocked_indices was empty but the initial check failed,
-            # or if all animations returned errors (though gather would likely raise one).
+            # or if the animation failed (though the controller would likely raise).
             self.notify("No dice were effectively rolled.", severity="warning", timeout=2)
 
         self.is_rolling = False
-        self.call_later(self.update_dice_visual_states)
 
 # --- End Main Application Class ---
 